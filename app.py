@@ -6,7 +6,7 @@ Modular architecture with multiple creative tools
 import streamlit as st
 from pathlib import Path
 from compositor import Compositor
-from ui.styles import inject_css, ICONS
+from ui.styles import inject_css, ICONS_HTML
 from utils.file_scanner import scan_inputs
 from tools import overlay_tool, text_tool
 
@@ -21,16 +21,23 @@ st.set_page_config(
 # Inject custom CSS
 inject_css()
 
+
+@st.cache_resource
+def get_compositor(base_path: Path) -> Compositor:
+    """Create the Compositor once and share it across reruns"""
+    return Compositor(base_path)
+
+
 # Initialize
 BASE_PATH = Path(__file__).parent
-comp = Compositor(BASE_PATH)
+comp = get_compositor(BASE_PATH)
 
 
 def main():
-    st.markdown(f'<h1><span style="color: #7cb518">{ICONS["layers"]}</span> Creative Compositor</h1>', unsafe_allow_html=True)
+    st.markdown(f'<h1>{ICONS_HTML["layers"]} Creative Compositor</h1>', unsafe_allow_html=True)
     st.markdown('<p style="color: #8a8a9a; margin-top: -10px;">Multiple creative tools for compositing and text overlays</p>', unsafe_allow_html=True)
 
-    # Scan for files
+    # Scan for files - only re-walks the input folders when they change
     inputs = scan_inputs(BASE_PATH)
 
     # Tool selector in sidebar
@@ -3,10 +3,13 @@ Creative Compositor - Core rendering logic
 Handles static PNG overlays and video MOV overlays on hero images
 """
 
+import os
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageFont
 from typing import Optional
 import shutil
 import tempfile
@@ -14,6 +17,38 @@ import tempfile
 # Import file scanning utilities for backwards compatibility
 from utils.file_scanner import scan_inputs
 
+# Concurrent ffmpeg encodes in render_all - each one is already multi-threaded
+VIDEO_RENDER_WORKERS = 2
+
+
+@lru_cache(maxsize=128)
+def _probe_duration(video_path: str, mtime_ns: int) -> float:
+    """Run ffprobe for a video's duration, cached per file version"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        video_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        return float(result.stdout.strip())
+    except:
+        return 5.0  # Default fallback
+
+
+@lru_cache(maxsize=256)
+def load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a font face once per (file, size) - shared by batch renders and UI previews"""
+    return ImageFont.truetype(font_path, size)
+
+
+@lru_cache(maxsize=128)
+def _image_size(image_path: str, mtime_ns: int) -> tuple:
+    """Read image dimensions from the header, cached per file version"""
+    with Image.open(image_path) as img:
+        return img.size
+
 
 class Compositor:
     def __init__(self, base_path: Path = None):
@@ -149,17 +184,7 @@ class Compositor:
     
     def _get_video_duration(self, video_path: Path) -> float:
         """Get duration of a video file in seconds"""
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(video_path)
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        try:
-            return float(result.stdout.strip())
-        except:
-            return 5.0  # Default fallback
+        return _probe_duration(str(video_path), video_path.stat().st_mtime_ns)
 
     def extract_first_frame(self, video_path: Path, frame_position: float = 0.0) -> Optional[Image.Image]:
         """
@@ -209,8 +234,7 @@ class Compositor:
 
     def get_hero_dimensions(self, hero_path: Path) -> tuple:
         """Get dimensions of a hero image"""
-        with Image.open(hero_path) as img:
-            return img.size
+        return _image_size(str(hero_path), hero_path.stat().st_mtime_ns)
 
     def get_text_config(self, format_type: str) -> dict:
         """Get text overlay configuration for a format"""
@@ -264,7 +288,7 @@ class Compositor:
             True if successful, False otherwise
         """
         try:
-            from PIL import ImageDraw, ImageFont
+            from PIL import ImageDraw
 
             # Load hero image
             hero = Image.open(hero_path).convert("RGBA")
@@ -274,7 +298,7 @@ class Compositor:
 
             # Load font
             if font_path and font_path.exists():
-                font = ImageFont.truetype(str(font_path), font_size)
+                font = load_font(str(font_path), font_size)
             else:
                 # Fallback to default font
                 font = ImageFont.load_default()
@@ -323,7 +347,7 @@ class Compositor:
             hero_path: Path to hero image
             output_path: Where to save the result
             lines: List of dicts with keys: text, size, style (e.g., [{"text": "LINE 1", "size": 72, "style": "Bold"}])
-            font_family: Dict of font variants (e.g., {"Regular": Path(...), "Bold": Path(...)})
+            font_family: Dict of font variant path strings (e.g., {"Regular": "/.../Arial.ttf", "Bold": "/.../Arial-Bold.ttf"})
             color: Hex color code for all lines
             position: Dict with x, y, alignment keys (for the whole text block)
             line_spacing: Vertical pixels between lines
@@ -332,7 +356,7 @@ class Compositor:
             True if successful, False otherwise
         """
         try:
-            from PIL import ImageDraw, ImageFont
+            from PIL import ImageDraw
 
             # Load hero image
             hero = Image.open(hero_path).convert("RGBA")
@@ -360,8 +384,8 @@ class Compositor:
 
                 # Load appropriate font variant
                 font_path = font_family.get(style, font_family.get("Regular"))
-                if font_path and font_path.exists():
-                    font = ImageFont.truetype(str(font_path), size)
+                if font_path:
+                    font = load_font(str(font_path), size)
                 else:
                     font = ImageFont.load_default()
 
@@ -472,28 +496,53 @@ class Compositor:
                 else:
                     output_path = self.base_path / "outputs" / format_type / output_name
                 all_tasks.append(("video", hero, overlay, output_path, pos, format_type))
-        
-        # Execute tasks
-        total = len(all_tasks)
+
+        # Heroes or overlays sharing a stem across subfolders map to the same
+        # output name - number the repeats so no two tasks write the same file
+        taken = set()
         for i, task in enumerate(all_tasks):
-            task_type, hero, overlay, output_path, pos, fmt = task
-            
-            if progress_callback:
-                progress_callback(i + 1, total, f"Rendering {output_path.name}")
-            
-            if task_type == "static":
-                success = self.composite_static(hero, overlay, output_path, pos)
-            else:
-                success = self.composite_video_overlay(hero, overlay, output_path, pos)
-            
-            if success:
-                results["success"] += 1
-                results["outputs"].append(str(output_path))
-            else:
-                results["failed"] += 1
-        
+            output_path = task[3]
+            n = 1
+            while output_path in taken:
+                n += 1
+                output_path = task[3].with_stem(f"{task[3].stem}_{n}")
+            taken.add(output_path)
+            all_tasks[i] = task[:3] + (output_path,) + task[4:]
+
+        # Execute tasks in parallel - each output is independent and PIL
+        # releases the GIL while compositing. Each video task is an ffmpeg
+        # encode that already uses every core, so those get a small pool
+        total = len(all_tasks)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as static_pool, \
+                ThreadPoolExecutor(max_workers=VIDEO_RENDER_WORKERS) as video_pool:
+            futures = {
+                (video_pool if task[0] == "video" else static_pool).submit(self._run_task, task): task
+                for task in all_tasks
+            }
+
+            # Progress is reported from this thread, so callbacks may touch the UI
+            for i, future in enumerate(as_completed(futures)):
+                output_path = futures[future][3]
+
+                if progress_callback:
+                    progress_callback(i + 1, total, f"Rendered {output_path.name}")
+
+                if future.result():
+                    results["success"] += 1
+                    results["outputs"].append(str(output_path))
+                else:
+                    results["failed"] += 1
+
         return results
 
+    def _run_task(self, task: tuple) -> bool:
+        """Render a single task from render_all"""
+        task_type, hero, overlay, output_path, pos, fmt = task
+
+        if task_type == "static":
+            return self.composite_static(hero, overlay, output_path, pos)
+        return self.composite_video_overlay(hero, overlay, output_path, pos)
+
 
 if __name__ == "__main__":
     # CLI test
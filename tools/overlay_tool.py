@@ -4,11 +4,13 @@ Position overlays (static PNG and video) on hero images with live preview
 """
 
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
-from ui.styles import ICONS
-from ui.preview import create_preview
+from ui.styles import ICONS, ICONS_HTML
+from ui.preview import create_preview, encode_preview, load_hero_array
 from utils.file_scanner import (
+    clear_scan_cache,
     flatten_files,
     get_subfolders,
     filter_by_subfolder,
@@ -17,6 +19,71 @@ from utils.file_scanner import (
 )
 
 
+@st.cache_data(show_spinner=False)
+def probe_video_durations(_comp, path_sig: tuple) -> dict:
+    """
+    Probe all video overlay durations in parallel
+
+    Args:
+        _comp: Compositor instance (not hashed by Streamlit)
+        path_sig: Tuple of (path, mtime) pairs, used as the cache key
+
+    Returns:
+        Dict mapping video Path to duration in seconds. Videos that could not
+        be probed (file gone, ffprobe missing) are left out
+    """
+    paths = [Path(path_str) for path_str, _ in path_sig]
+    if not paths:
+        return {}
+
+    def probe(path):
+        try:
+            return _comp._get_video_duration(path)
+        except OSError:
+            return None
+
+    # Each probe is an ffprobe subprocess, so threads overlap the startup cost
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        durations = executor.map(probe, paths)
+        return {path: duration for path, duration in zip(paths, durations) if duration is not None}
+
+
+def overlay_entries(overlays_static: dict, overlays_video: dict, static_files: list, video_files: list) -> list[tuple]:
+    """
+    Build overlay selectbox entries with precomputed labels
+
+    Args:
+        overlays_static: Static overlay file dict, for labels
+        overlays_video: Video overlay file dict, for labels
+        static_files: Static overlay paths to list
+        video_files: Video overlay paths to list
+
+    Returns:
+        List of (path, is_video, label) tuples, static overlays first
+    """
+    return [
+        *((path, False, f"{get_file_label(path, overlays_static)} [STATIC]") for path in static_files),
+        *((path, True, f"{get_file_label(path, overlays_video)} [VIDEO]") for path in video_files)
+    ]
+
+
+def output_counts(counts: dict) -> dict:
+    """
+    Get the number of render outputs per overlay type and format
+
+    Args:
+        counts: Dict mapping input keys to file counts
+
+    Returns:
+        Dict with static_1x1, static_9x16, video_1x1, video_9x16 output counts
+    """
+    return {
+        f"{overlay_type}_{fmt}": counts[f"heroes_{fmt}"] * counts[f"overlays_{overlay_type}_{fmt}"]
+        for overlay_type in ("static", "video")
+        for fmt in ("1x1", "9x16")
+    }
+
+
 def render(comp, inputs, base_path):
     """
     Render the overlay compositor tool UI
@@ -26,38 +93,55 @@ def render(comp, inputs, base_path):
         inputs: Dict of scanned input files
         base_path: Base path for the project
     """
+    # File counts per input bucket, shared by the sidebar and render tab
+    counts = {key: len(flatten_files(file_dict)) for key, file_dict in inputs.items()}
+    outputs = output_counts(counts)
+
     # Sidebar - file status
     with st.sidebar:
         st.markdown(f'<div class="icon" style="font-size: 1.2rem; font-weight: 600; margin-bottom: 16px;">{ICONS["folder"]} Input Files</div>', unsafe_allow_html=True)
 
-        st.markdown('<p class="section-header">Heroes</p>', unsafe_allow_html=True)
-        st.write(f"1x1: {len(flatten_files(inputs['heroes_1x1']))} files")
-        st.write(f"9x16: {len(flatten_files(inputs['heroes_9x16']))} files")
-
-        st.markdown('<p class="section-header" style="margin-top: 16px;">Overlays (1x1)</p>', unsafe_allow_html=True)
-        st.write(f"Static: {len(flatten_files(inputs['overlays_static_1x1']))} files")
-        st.write(f"Video: {len(flatten_files(inputs['overlays_video_1x1']))} files")
-
-        st.markdown('<p class="section-header" style="margin-top: 16px;">Overlays (9x16)</p>', unsafe_allow_html=True)
-        st.write(f"Static: {len(flatten_files(inputs['overlays_static_9x16']))} files")
-        st.write(f"Video: {len(flatten_files(inputs['overlays_video_9x16']))} files")
+        # Single element for all counts - one delta per rerun instead of nine
+        st.markdown("\n".join([
+            '<p class="section-header">Heroes</p>',
+            "",
+            f"- 1x1: **{counts['heroes_1x1']}** files",
+            f"- 9x16: **{counts['heroes_9x16']}** files",
+            "",
+            '<p class="section-header" style="margin-top: 16px;">Overlays (1x1)</p>',
+            "",
+            f"- Static: **{counts['overlays_static_1x1']}** files",
+            f"- Video: **{counts['overlays_video_1x1']}** files",
+            "",
+            '<p class="section-header" style="margin-top: 16px;">Overlays (9x16)</p>',
+            "",
+            f"- Static: **{counts['overlays_static_9x16']}** files",
+            f"- Video: **{counts['overlays_video_9x16']}** files",
+        ]), unsafe_allow_html=True)
 
         st.markdown('<div style="border-top: 1px solid #2a2a3a; margin: 20px 0;"></div>', unsafe_allow_html=True)
 
-        heroes_1x1_all = flatten_files(inputs['heroes_1x1'])
-        heroes_9x16_all = flatten_files(inputs['heroes_9x16'])
-        overlays_1x1_all = flatten_files(inputs['overlays_static_1x1']) + flatten_files(inputs['overlays_video_1x1'])
-        overlays_9x16_all = flatten_files(inputs['overlays_static_9x16']) + flatten_files(inputs['overlays_video_9x16'])
-
-        total_1x1 = len(heroes_1x1_all) * len(overlays_1x1_all)
-        total_9x16 = len(heroes_9x16_all) * len(overlays_9x16_all)
-        st.metric("Total outputs", total_1x1 + total_9x16)
+        st.metric("Total outputs", sum(outputs.values()))
 
         st.markdown('<div style="border-top: 1px solid #2a2a3a; margin: 20px 0;"></div>', unsafe_allow_html=True)
 
         if st.button(f"Refresh Files", icon=":material/refresh:"):
+            # Force a full rescan, in case a change slipped past the mtime check
+            clear_scan_cache()
             st.rerun()
 
+    # Probe every video overlay once per file change rather than per selection.
+    # Done after the sidebar so Refresh Files is always drawn, and files
+    # deleted since the last scan are skipped rather than raising
+    videos = flatten_files(inputs['overlays_video_1x1']) + flatten_files(inputs['overlays_video_9x16'])
+    path_sig = []
+    for video in videos:
+        try:
+            path_sig.append((str(video), video.stat().st_mtime_ns))
+        except OSError:
+            continue
+    durations = probe_video_durations(comp, tuple(path_sig))
+
     # Main area - tabs for each format
     tab1, tab2, tab3 = st.tabs([
         f"1x1 Position",
@@ -67,302 +151,210 @@ def render(comp, inputs, base_path):
 
     # --- 1x1 Tab ---
     with tab1:
-        render_1x1_tab(comp, inputs)
+        render_position_tab(comp, inputs, durations, "1x1", "square", (-540, 1080), 600)
 
     # --- 9x16 Tab ---
     with tab2:
-        render_9x16_tab(comp, inputs)
+        render_position_tab(comp, inputs, durations, "9x16", "smartphone", (-960, 1920), 500)
 
     # --- Render Tab ---
     with tab3:
-        render_render_tab(comp, inputs, base_path)
+        render_render_tab(comp, inputs, base_path, outputs)
 
 
-def render_1x1_tab(comp, inputs):
-    """Render the 1x1 positioning tab"""
-    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;"><span style="color: #7cb518">{ICONS["square"]}</span> 1x1 Format Positioning</h3>', unsafe_allow_html=True)
+def render_position_tab(comp, inputs, durations, fmt, icon, default_y_bounds, max_display):
+    """
+    Render the positioning tab for one format
 
-    heroes_1x1_flat = flatten_files(inputs['heroes_1x1'])
-    overlays_static_1x1_flat = flatten_files(inputs['overlays_static_1x1'])
-    overlays_video_1x1_flat = flatten_files(inputs['overlays_video_1x1'])
+    Args:
+        comp: Compositor instance
+        inputs: Dict of scanned input files
+        durations: Dict of probed video overlay durations
+        fmt: Format key ("1x1" or "9x16")
+        icon: ICONS key for the tab header
+        default_y_bounds: (min, max) Y slider bounds used when no hero is selected
+        max_display: Max preview width/height in pixels
+    """
+    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;">{ICONS_HTML[icon]} {fmt} Format Positioning</h3>', unsafe_allow_html=True)
 
-    if not heroes_1x1_flat:
-        st.warning("No 1x1 heroes found. Add images to `inputs/heroes/1x1/`")
-    elif not overlays_static_1x1_flat and not overlays_video_1x1_flat:
-        st.warning("No 1x1 overlays found. Add files to `inputs/overlays/static/1x1/` or `inputs/overlays/video/1x1/`")
+    heroes = inputs[f'heroes_{fmt}']
+    overlays_static = inputs[f'overlays_static_{fmt}']
+    overlays_video = inputs[f'overlays_video_{fmt}']
+
+    if not flatten_files(heroes):
+        st.warning(f"No {fmt} heroes found. Add images to `inputs/heroes/{fmt}/`")
+    elif not flatten_files(overlays_static) and not flatten_files(overlays_video):
+        st.warning(f"No {fmt} overlays found. Add files to `inputs/overlays/static/{fmt}/` or `inputs/overlays/video/{fmt}/`")
     else:
         col1, col2 = st.columns([1, 2])
 
         with col1:
             # Subfolder filters
-            hero_subfolders_1x1 = get_subfolders(inputs['heroes_1x1'])
-            overlay_subfolders_1x1 = get_subfolders(inputs['overlays_static_1x1'])
+            hero_subfolders = get_subfolders(heroes)
+            overlay_subfolders = get_subfolders(overlays_static)
 
             col_sf1, col_sf2 = st.columns(2)
             with col_sf1:
-                hero_sf_1x1 = st.selectbox("Hero folder", hero_subfolders_1x1, key="hero_sf_1x1")
+                hero_sf = st.selectbox("Hero folder", hero_subfolders, key=f"hero_sf_{fmt}")
             with col_sf2:
-                overlay_sf_1x1 = st.selectbox("Overlay folder", overlay_subfolders_1x1, key="overlay_sf_1x1")
+                overlay_sf = st.selectbox("Overlay folder", overlay_subfolders, key=f"overlay_sf_{fmt}")
 
             st.markdown('<div style="border-top: 1px solid #2a2a3a; margin: 12px 0;"></div>', unsafe_allow_html=True)
 
             # Filter files by subfolder
-            heroes_1x1_filtered = filter_by_subfolder(inputs['heroes_1x1'], hero_sf_1x1)
-            overlays_static_1x1_filtered = filter_by_subfolder(inputs['overlays_static_1x1'], overlay_sf_1x1)
-            overlays_video_1x1_filtered = filter_by_subfolder(inputs['overlays_video_1x1'], overlay_sf_1x1)
+            heroes_filtered = filter_by_subfolder(heroes, hero_sf)
+            overlays_static_filtered = filter_by_subfolder(overlays_static, overlay_sf)
+            overlays_video_filtered = filter_by_subfolder(overlays_video, overlay_sf)
 
             # Select preview files
-            hero_1x1 = st.selectbox(
+            hero = st.selectbox(
                 "Preview Hero",
-                heroes_1x1_filtered,
-                format_func=lambda x: get_file_label(x, inputs['heroes_1x1']),
-                key="hero_1x1"
+                heroes_filtered,
+                format_func=lambda x: get_file_label(x, heroes),
+                key=f"hero_{fmt}"
             )
 
             # Combine static and video overlays for preview
-            all_overlays_1x1 = overlays_static_1x1_filtered + overlays_video_1x1_filtered
+            entries = overlay_entries(overlays_static, overlays_video, overlays_static_filtered, overlays_video_filtered)
+            overlay_labels = {path: label for path, _, label in entries}
+            video_overlays = {path for path, is_video, _ in entries if is_video}
+
             overlay_preview = st.selectbox(
                 "Preview Overlay",
-                all_overlays_1x1,
-                format_func=lambda x: f"{get_file_label(x, inputs['overlays_static_1x1'] if x.suffix.lower() == '.png' else inputs['overlays_video_1x1'])} {'[VIDEO]' if x.suffix.lower() in ['.mov', '.mp4'] else '[STATIC]'}",
-                key="overlay_1x1"
+                [path for path, _, _ in entries],
+                format_func=overlay_labels.__getitem__,
+                key=f"overlay_{fmt}"
             )
 
             # Get hero dimensions for slider bounds
-            if hero_1x1:
-                hero_dims = comp.get_hero_dimensions(hero_1x1)
-                st.caption(f"Hero size: {hero_dims[0]}x{hero_dims[1]}")
+            if hero:
+                try:
+                    hero_dims = comp.get_hero_dimensions(hero)
+                    st.caption(f"Hero size: {hero_dims[0]}x{hero_dims[1]}")
+                except OSError:
+                    # Deleted or unreadable since the last scan - use the default bounds
+                    st.warning(f"Can't read {hero.name}. Click Refresh Files to rescan.")
+                    hero = None
 
             st.divider()
 
             # Detect overlay type and load appropriate position
-            is_video_1x1 = overlay_preview and overlay_preview.suffix.lower() in ['.mov', '.mp4']
-            overlay_type_1x1 = "video" if is_video_1x1 else "static"
-            pos = comp.get_position("1x1", overlay_type_1x1)
+            is_video = overlay_preview in video_overlays
+            overlay_type = "video" if is_video else "static"
+            pos = comp.get_position(fmt, overlay_type)
 
             # Frame position slider for video previews
-            if is_video_1x1:
-                frame_pos_1x1 = st.slider(
+            if is_video:
+                frame_pos = st.slider(
                     "Preview Frame Position",
                     min_value=0.0,
                     max_value=1.0,
                     value=0.5,
                     step=0.01,
                     help="Scrub through video to find positioning frame (0% = start, 100% = end)",
-                    key=f"frame_pos_1x1_{overlay_type_1x1}"
+                    key=f"frame_pos_{fmt}_{overlay_type}"
                 )
-                st.caption(f"Preview at: {int(frame_pos_1x1 * 100)}%")
+                st.caption(f"Preview at: {int(frame_pos * 100)}%")
             else:
-                frame_pos_1x1 = 0.0
-
-            x_1x1 = st.slider(
-                "X Position",
-                min_value=-(hero_dims[0] // 2) if hero_1x1 else -540,
-                max_value=hero_dims[0] if hero_1x1 else 1080,
-                value=int(pos["x"]),
-                key=f"x_1x1_{overlay_type_1x1}"
-            )
-
-            y_1x1 = st.slider(
-                "Y Position",
-                min_value=-(hero_dims[1] // 2) if hero_1x1 else -540,
-                max_value=hero_dims[1] if hero_1x1 else 1080,
-                value=int(pos["y"]),
-                key=f"y_1x1_{overlay_type_1x1}"
-            )
-
-            scale_1x1 = st.slider(
-                "Scale",
-                min_value=0.1,
-                max_value=2.0,
-                value=float(pos.get("scale", 1.0)),
-                step=0.05,
-                key=f"scale_1x1_{overlay_type_1x1}"
-            )
-
-            # Video loop settings
-            if overlay_preview and overlay_preview.suffix.lower() in ['.mov', '.mp4']:
-                st.divider()
-                overlay_duration = comp._get_video_duration(overlay_preview)
-                st.caption(f"Overlay duration: {overlay_duration:.2f}s")
-
-                loop_count_1x1 = st.slider(
-                    "Loop Count",
-                    min_value=1,
-                    max_value=10,
-                    value=int(pos.get("loop_count", 1)),
-                    key=f"loop_1x1_{overlay_type_1x1}"
+                frame_pos = 0.0
+
+            # Batch position controls so dragging a slider doesn't rerun the preview
+            with st.form(f"pos_{fmt}"):
+                x = st.slider(
+                    "X Position",
+                    min_value=-(hero_dims[0] // 2) if hero else -540,
+                    max_value=hero_dims[0] if hero else 1080,
+                    value=int(pos["x"]),
+                    key=f"x_{fmt}_{overlay_type}"
                 )
 
-                final_duration = overlay_duration * loop_count_1x1
-                st.caption(f"Final video: {final_duration:.2f}s")
-            else:
-                loop_count_1x1 = 1
-
-            st.divider()
-
-            if st.button("Save 1x1 Position", type="primary", icon=":material/check:"):
-                comp.set_position("1x1", x_1x1, y_1x1, scale_1x1, loop_count_1x1, overlay_type_1x1)
-                st.success(f"Position saved for 1x1 {overlay_type_1x1} overlays!")
-
-        with col2:
-            # Live preview
-            if hero_1x1 and overlay_preview:
-                preview_pos = {"x": x_1x1, "y": y_1x1, "scale": scale_1x1}
-                preview = create_preview(hero_1x1, overlay_preview, preview_pos, frame_pos_1x1, comp)
-
-                # Resize for display if needed
-                max_display = 600
-                if preview.width > max_display or preview.height > max_display:
-                    ratio = min(max_display / preview.width, max_display / preview.height)
-                    display_size = (int(preview.width * ratio), int(preview.height * ratio))
-                    preview = preview.resize(display_size, Image.Resampling.LANCZOS)
-
-                st.image(preview, caption="Live Preview", use_container_width=False)
-
-
-def render_9x16_tab(comp, inputs):
-    """Render the 9x16 positioning tab"""
-    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;"><span style="color: #7cb518">{ICONS["smartphone"]}</span> 9x16 Format Positioning</h3>', unsafe_allow_html=True)
-
-    heroes_9x16_flat = flatten_files(inputs['heroes_9x16'])
-    overlays_static_9x16_flat = flatten_files(inputs['overlays_static_9x16'])
-    overlays_video_9x16_flat = flatten_files(inputs['overlays_video_9x16'])
-
-    if not heroes_9x16_flat:
-        st.warning("No 9x16 heroes found. Add images to `inputs/heroes/9x16/`")
-    elif not overlays_static_9x16_flat and not overlays_video_9x16_flat:
-        st.warning("No 9x16 overlays found. Add files to `inputs/overlays/static/9x16/` or `inputs/overlays/video/9x16/`")
-    else:
-        col1, col2 = st.columns([1, 2])
-
-        with col1:
-            # Subfolder filters
-            hero_subfolders_9x16 = get_subfolders(inputs['heroes_9x16'])
-            overlay_subfolders_9x16 = get_subfolders(inputs['overlays_static_9x16'])
-
-            col_sf1, col_sf2 = st.columns(2)
-            with col_sf1:
-                hero_sf_9x16 = st.selectbox("Hero folder", hero_subfolders_9x16, key="hero_sf_9x16")
-            with col_sf2:
-                overlay_sf_9x16 = st.selectbox("Overlay folder", overlay_subfolders_9x16, key="overlay_sf_9x16")
-
-            st.markdown('<div style="border-top: 1px solid #2a2a3a; margin: 12px 0;"></div>', unsafe_allow_html=True)
-
-            # Filter files by subfolder
-            heroes_9x16_filtered = filter_by_subfolder(inputs['heroes_9x16'], hero_sf_9x16)
-            overlays_static_9x16_filtered = filter_by_subfolder(inputs['overlays_static_9x16'], overlay_sf_9x16)
-            overlays_video_9x16_filtered = filter_by_subfolder(inputs['overlays_video_9x16'], overlay_sf_9x16)
-
-            hero_9x16 = st.selectbox(
-                "Preview Hero",
-                heroes_9x16_filtered,
-                format_func=lambda x: get_file_label(x, inputs['heroes_9x16']),
-                key="hero_9x16"
-            )
-
-            # Combine static and video overlays for preview
-            all_overlays_9x16 = overlays_static_9x16_filtered + overlays_video_9x16_filtered
-            overlay_preview_9x16 = st.selectbox(
-                "Preview Overlay",
-                all_overlays_9x16,
-                format_func=lambda x: f"{get_file_label(x, inputs['overlays_static_9x16'] if x.suffix.lower() == '.png' else inputs['overlays_video_9x16'])} {'[VIDEO]' if x.suffix.lower() in ['.mov', '.mp4'] else '[STATIC]'}",
-                key="overlay_9x16"
-            )
-
-            if hero_9x16:
-                hero_dims_9x16 = comp.get_hero_dimensions(hero_9x16)
-                st.caption(f"Hero size: {hero_dims_9x16[0]}x{hero_dims_9x16[1]}")
-
-            st.divider()
-
-            # Detect overlay type and load appropriate position
-            is_video_9x16 = overlay_preview_9x16 and overlay_preview_9x16.suffix.lower() in ['.mov', '.mp4']
-            overlay_type_9x16 = "video" if is_video_9x16 else "static"
-            pos_9x16 = comp.get_position("9x16", overlay_type_9x16)
-
-            # Frame position slider for video previews
-            if is_video_9x16:
-                frame_pos_9x16 = st.slider(
-                    "Preview Frame Position",
-                    min_value=0.0,
-                    max_value=1.0,
-                    value=0.5,
-                    step=0.01,
-                    help="Scrub through video to find positioning frame (0% = start, 100% = end)",
-                    key=f"frame_pos_9x16_{overlay_type_9x16}"
+                y = st.slider(
+                    "Y Position",
+                    min_value=-(hero_dims[1] // 2) if hero else default_y_bounds[0],
+                    max_value=hero_dims[1] if hero else default_y_bounds[1],
+                    value=int(pos["y"]),
+                    key=f"y_{fmt}_{overlay_type}"
                 )
-                st.caption(f"Preview at: {int(frame_pos_9x16 * 100)}%")
-            else:
-                frame_pos_9x16 = 0.0
-
-            x_9x16 = st.slider(
-                "X Position",
-                min_value=-(hero_dims_9x16[0] // 2) if hero_9x16 else -540,
-                max_value=hero_dims_9x16[0] if hero_9x16 else 1080,
-                value=int(pos_9x16["x"]),
-                key=f"x_9x16_{overlay_type_9x16}"
-            )
 
-            y_9x16 = st.slider(
-                "Y Position",
-                min_value=-(hero_dims_9x16[1] // 2) if hero_9x16 else -960,
-                max_value=hero_dims_9x16[1] if hero_9x16 else 1920,
-                value=int(pos_9x16["y"]),
-                key=f"y_9x16_{overlay_type_9x16}"
-            )
-
-            scale_9x16 = st.slider(
-                "Scale",
-                min_value=0.1,
-                max_value=2.0,
-                value=float(pos_9x16.get("scale", 1.0)),
-                step=0.05,
-                key=f"scale_9x16_{overlay_type_9x16}"
-            )
-
-            # Video loop settings
-            if overlay_preview_9x16 and overlay_preview_9x16.suffix.lower() in ['.mov', '.mp4']:
-                st.divider()
-                overlay_duration = comp._get_video_duration(overlay_preview_9x16)
-                st.caption(f"Overlay duration: {overlay_duration:.2f}s")
-
-                loop_count_9x16 = st.slider(
-                    "Loop Count",
-                    min_value=1,
-                    max_value=10,
-                    value=int(pos_9x16.get("loop_count", 1)),
-                    key=f"loop_9x16_{overlay_type_9x16}"
+                scale = st.slider(
+                    "Scale",
+                    min_value=0.1,
+                    max_value=2.0,
+                    value=float(pos.get("scale", 1.0)),
+                    step=0.05,
+                    key=f"scale_{fmt}_{overlay_type}"
                 )
 
-                final_duration = overlay_duration * loop_count_9x16
-                st.caption(f"Final video: {final_duration:.2f}s")
-            else:
-                loop_count_9x16 = 1
-
-            st.divider()
-
-            if st.button("Save 9x16 Position", type="primary", icon=":material/check:"):
-                comp.set_position("9x16", x_9x16, y_9x16, scale_9x16, loop_count_9x16, overlay_type_9x16)
-                st.success(f"Position saved for 9x16 {overlay_type_9x16} overlays!")
+                # Video loop settings
+                if is_video:
+                    st.divider()
+                    overlay_duration = durations.get(overlay_preview)
+                    if overlay_duration is not None:
+                        st.caption(f"Overlay duration: {overlay_duration:.2f}s")
+                    else:
+                        st.caption("Overlay duration: unknown (ffprobe unavailable or file missing)")
+
+                    loop_count = st.slider(
+                        "Loop Count",
+                        min_value=1,
+                        max_value=10,
+                        value=int(pos.get("loop_count", 1)),
+                        key=f"loop_{fmt}_{overlay_type}"
+                    )
+
+                    if overlay_duration is not None:
+                        final_duration = overlay_duration * loop_count
+                        st.caption(f"Final video: {final_duration:.2f}s")
+                else:
+                    loop_count = 1
+
+                st.form_submit_button("Update Preview", icon=":material/visibility:", use_container_width=True)
+
+                # Also a submit button, so the slider values being saved are the ones on screen
+                save = st.form_submit_button(f"Save {fmt} Position", type="primary", icon=":material/check:", use_container_width=True)
+
+            if save:
+                comp.set_position(fmt, x, y, scale, loop_count, overlay_type)
+                st.success(f"Position saved for {fmt} {overlay_type} overlays!")
 
         with col2:
-            if hero_9x16 and overlay_preview_9x16:
-                preview_pos = {"x": x_9x16, "y": y_9x16, "scale": scale_9x16}
-                preview = create_preview(hero_9x16, overlay_preview_9x16, preview_pos, frame_pos_9x16, comp)
-
-                max_display = 500
-                if preview.width > max_display or preview.height > max_display:
-                    ratio = min(max_display / preview.width, max_display / preview.height)
-                    display_size = (int(preview.width * ratio), int(preview.height * ratio))
-                    preview = preview.resize(display_size, Image.Resampling.LANCZOS)
-
-                st.image(preview, caption="Live Preview", use_container_width=False)
-
-
-def render_render_tab(comp, inputs, base_path):
+            # Live preview
+            if hero and overlay_preview:
+                try:
+                    # Reuse the last preview if nothing that affects it has changed.
+                    # mtimes are part of the key so a file replaced in place is redrawn
+                    hero_mtime = hero.stat().st_mtime_ns
+                    overlay_mtime = overlay_preview.stat().st_mtime_ns
+                    preview_key = (str(hero), hero_mtime, str(overlay_preview), overlay_mtime, x, y, scale, frame_pos)
+
+                    if st.session_state.get(f"last_{fmt}_key") == preview_key:
+                        preview_bytes = st.session_state[f"last_{fmt}_img"]
+                    else:
+                        preview_pos = {"x": x, "y": y, "scale": scale}
+                        hero_rgba = load_hero_array(str(hero), hero_mtime)
+                        preview = create_preview(hero_rgba, overlay_preview, preview_pos, frame_pos, comp)
+
+                        # Resize for display in place - no-op when already small enough
+                        preview.thumbnail((max_display, max_display), Image.Resampling.BILINEAR)
+
+                        # JPEG keeps the websocket payload small; the preview has no use for alpha
+                        preview_bytes = encode_preview(preview)
+
+                        st.session_state[f"last_{fmt}_key"] = preview_key
+                        st.session_state[f"last_{fmt}_img"] = preview_bytes
+                except OSError:
+                    # Hero or overlay deleted since the last scan
+                    preview_bytes = None
+
+                if preview_bytes:
+                    st.image(preview_bytes, caption="Live Preview", use_container_width=False, output_format="JPEG")
+                else:
+                    st.warning("Preview files are no longer available. Click Refresh Files to rescan.")
+
+
+def render_render_tab(comp, inputs, base_path, outputs):
     """Render the batch render tab"""
-    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;"><span style="color: #7cb518">{ICONS["play"]}</span> Batch Render</h3>', unsafe_allow_html=True)
+    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;">{ICONS_HTML["play"]} Batch Render</h3>', unsafe_allow_html=True)
 
     col1, col2 = st.columns(2)
 
@@ -379,10 +371,10 @@ def render_render_tab(comp, inputs, base_path):
     with col2:
         st.markdown('<p class="section-header">Output Summary</p>', unsafe_allow_html=True)
 
-        static_1x1 = len(flatten_files(inputs['heroes_1x1'])) * len(flatten_files(inputs['overlays_static_1x1']))
-        static_9x16 = len(flatten_files(inputs['heroes_9x16'])) * len(flatten_files(inputs['overlays_static_9x16']))
-        video_1x1 = len(flatten_files(inputs['heroes_1x1'])) * len(flatten_files(inputs['overlays_video_1x1']))
-        video_9x16 = len(flatten_files(inputs['heroes_9x16'])) * len(flatten_files(inputs['overlays_video_9x16']))
+        static_1x1 = outputs['static_1x1']
+        static_9x16 = outputs['static_9x16']
+        video_1x1 = outputs['video_1x1']
+        video_9x16 = outputs['video_9x16']
 
         st.write(f"1x1 outputs: **{static_1x1 + video_1x1}** ({static_1x1} static, {video_1x1} video)")
         st.write(f"9x16 outputs: **{static_9x16 + video_9x16}** ({static_9x16} static, {video_9x16} video)")
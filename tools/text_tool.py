@@ -5,9 +5,8 @@ Add custom 3-line text overlays with independent font styles
 
 import streamlit as st
 from pathlib import Path
-from PIL import Image
-from ui.styles import ICONS
-from ui.preview import create_multiline_text_preview
+from ui.styles import ICONS, ICONS_HTML
+from ui.preview import create_multiline_text_preview, encode_preview
 from utils.file_scanner import flatten_files, scan_font_families
 
 
@@ -63,7 +62,7 @@ def render(comp, inputs, base_path):
 
 def render_design_tab(comp, inputs, base_path, font_families):
     """Render the 3-line text design and preview tab"""
-    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;"><span style="color: #7cb518">{ICONS["edit"]}</span> 3-Line Text Design</h3>', unsafe_allow_html=True)
+    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;">{ICONS_HTML["edit"]} 3-Line Text Design</h3>', unsafe_allow_html=True)
 
     if not font_families:
         st.error("No fonts available. Add .ttf or .otf files to `assets/fonts/` to get started.")
@@ -222,40 +221,56 @@ def render_design_tab(comp, inputs, base_path, font_families):
     with col2:
         # Live preview
         if hero:
-            preview_pos = {
-                "x": x_pos,
-                "y": y_pos,
-                "alignment": alignment_anchor
-            }
-
             # Only render lines that have text
             active_lines = [line for line in lines if line["text"]]
 
             if active_lines:
-                preview = create_multiline_text_preview(
-                    hero,
-                    active_lines,
-                    font_family,
+                # Reuse the last preview if nothing that affects it has changed.
+                # The hero mtime and resolved font paths catch files replaced on disk
+                preview_key = (
+                    str(hero),
+                    hero.stat().st_mtime_ns,
+                    tuple((line["text"], line["size"], line["style"]) for line in active_lines),
+                    tuple(font_family.items()),
                     color,
-                    preview_pos,
+                    x_pos,
+                    y_pos,
+                    alignment_anchor,
                     line_spacing
                 )
+                if st.session_state.get("text_preview_key") == preview_key:
+                    preview_bytes = st.session_state["text_preview_img"]
+                else:
+                    preview_pos = {
+                        "x": x_pos,
+                        "y": y_pos,
+                        "alignment": alignment_anchor
+                    }
+
+                    # Drawn directly at display size
+                    preview = create_multiline_text_preview(
+                        hero,
+                        active_lines,
+                        font_family,
+                        color,
+                        preview_pos,
+                        line_spacing,
+                        max_display=600
+                    )
+
+                    preview_bytes = encode_preview(preview)
 
-                # Resize for display if needed
-                max_display = 600
-                if preview.width > max_display or preview.height > max_display:
-                    ratio = min(max_display / preview.width, max_display / preview.height)
-                    display_size = (int(preview.width * ratio), int(preview.height * ratio))
-                    preview = preview.resize(display_size, Image.Resampling.LANCZOS)
+                    st.session_state["text_preview_key"] = preview_key
+                    st.session_state["text_preview_img"] = preview_bytes
 
-                st.image(preview, caption="Live Preview", use_container_width=False)
+                st.image(preview_bytes, caption="Live Preview", use_container_width=False, output_format="JPEG")
             else:
                 st.info("Enter text in Line 1, 2, or 3 to see preview")
 
 
 def render_batch_tab(comp, inputs, base_path, font_families):
     """Render the batch rendering tab"""
-    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;"><span style="color: #7cb518">{ICONS["play"]}</span> Batch 3-Line Text Render</h3>', unsafe_allow_html=True)
+    st.markdown(f'<h3 style="display: flex; align-items: center; gap: 10px; color: #f0f0f0;">{ICONS_HTML["play"]} Batch 3-Line Text Render</h3>', unsafe_allow_html=True)
 
     if not font_families:
         st.error("No fonts available. Add .ttf or .otf files to `assets/fonts/` first.")
@@ -3,17 +3,116 @@ UI Preview Components
 Functions for generating live preview composites
 """
 
+import io
+import numpy as np
+import streamlit as st
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageFont
 from typing import Optional
+from compositor import load_font
+from utils.file_scanner import VIDEO_EXTS
 
 
-def create_preview(hero_path: Path, overlay_path: Path, position: dict, frame_position: float = 0.0, compositor=None) -> Image.Image:
+# Full-resolution heroes are process-wide and a 4K RGBA frame is ~64 MB, so
+# only keep a few - enough for the 1x1 and 9x16 tabs plus a switch or two
+@st.cache_resource(max_entries=4)
+def load_hero_array(path_str: str, mtime_ns: int) -> np.ndarray:
+    """
+    Decode a hero image once into a contiguous RGBA array
+
+    The one full-resolution hero decoder - every preview that needs the
+    whole hero goes through it.
+
+    Args:
+        path_str: Path to hero image
+        mtime_ns: File modification time, so edited files are decoded again
+
+    Returns:
+        H x W x 4 uint8 array, shared across reruns - treat as read-only
+    """
+    with Image.open(path_str) as img:
+        return np.ascontiguousarray(np.asarray(img.convert("RGBA")))
+
+
+@st.cache_resource(max_entries=8)
+def _load_rgba(path_str: str, mtime_ns: int) -> Image.Image:
+    """Decode an overlay once as RGBA, shared across reruns - treat as read-only"""
+    with Image.open(path_str) as img:
+        return img.convert("RGBA")
+
+
+@st.cache_resource(max_entries=16)
+def _load_display_hero(path_str: str, mtime_ns: int, max_display: int) -> tuple[Image.Image, float]:
+    """
+    Decode a hero straight to display size as RGBA
+
+    JPEGs are decoded at a reduced DCT scale via draft(), and only the
+    display-size image is cached, so the full-resolution hero is never kept.
+
+    Returns:
+        (RGBA image at most max_display pixels, scale factor from the original)
+    """
+    with Image.open(path_str) as img:
+        k = min(1.0, max_display / max(img.size))
+        if k == 1.0:
+            return img.convert("RGBA"), k
+
+        size = (int(img.width * k), int(img.height * k))
+        img.draft(None, size)  # No-op for formats without reduced decoding
+        return img.convert("RGBA").resize(size, Image.Resampling.BILINEAR), k
+
+
+def _hex_to_rgb(color: str) -> tuple:
+    """Convert "#RRGGBB" to an (r, g, b) tuple with a single int parse"""
+    value = int(color.lstrip("#"), 16)
+    return (value >> 16 & 0xFF, value >> 8 & 0xFF, value & 0xFF)
+
+
+def encode_preview(image: Image.Image, quality: int = 85) -> bytes:
+    """
+    Encode a preview image as JPEG bytes for st.image
+
+    Passing already-encoded JPEG with output_format="JPEG" lets Streamlit send
+    the bytes as-is instead of PNG-encoding the image on every rerun.
+    """
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _alpha_over(dst: np.ndarray, src: np.ndarray, x: int, y: int):
+    """
+    Composite RGBA src over RGBA dst in place at (x, y), clipped to dst
+
+    Vectorized Porter-Duff "over", matching Image.alpha_composite.
+    """
+    height, width = dst.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + src.shape[1], width), min(y + src.shape[0], height)
+    if x0 >= x1 or y0 >= y1:
+        return  # Overlay is entirely off-canvas
+
+    region = dst[y0:y1, x0:x1]
+    src = src[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.float32)
+    dst_rgba = region.astype(np.float32)
+
+    src_a = src[..., 3:] / 255.0
+    dst_a = dst_rgba[..., 3:] / 255.0 * (1.0 - src_a)
+    out_a = src_a + dst_a
+
+    out_rgb = src[..., :3] * src_a + dst_rgba[..., :3] * dst_a
+    np.divide(out_rgb, out_a, out=out_rgb, where=out_a > 0)
+
+    region[..., :3] = out_rgb + 0.5
+    region[..., 3:] = out_a * 255.0 + 0.5
+
+
+def create_preview(hero: np.ndarray, overlay_path: Path, position: dict, frame_position: float = 0.0, compositor=None) -> Image.Image:
     """
     Create a preview composite image
 
     Args:
-        hero_path: Path to hero image
+        hero: Decoded RGBA hero array from load_hero_array
         overlay_path: Path to overlay (static PNG or video)
         position: Dict with x, y, scale keys
         frame_position: Position in video (0.0 = start, 1.0 = end) for video overlays
@@ -22,20 +121,18 @@ def create_preview(hero_path: Path, overlay_path: Path, position: dict, frame_po
     Returns:
         PIL Image of the composite preview
     """
-    hero = Image.open(hero_path).convert("RGBA")
-
     # Handle video overlays - extract frame at specified position
-    if overlay_path.suffix.lower() in ['.mov', '.mp4']:
+    if overlay_path.suffix.lower() in VIDEO_EXTS:
         if compositor is None:
             # Fallback: show hero only if no compositor provided
-            return hero
+            return Image.fromarray(hero)
 
         overlay = compositor.extract_first_frame(overlay_path, frame_position)
         if overlay is None:
             # Fallback: show hero only if frame extraction fails
-            return hero
+            return Image.fromarray(hero)
     else:
-        overlay = Image.open(overlay_path).convert("RGBA")
+        overlay = _load_rgba(str(overlay_path), overlay_path.stat().st_mtime_ns)
 
     # Scale overlay
     scale = position.get("scale", 1.0)
@@ -43,22 +140,23 @@ def create_preview(hero_path: Path, overlay_path: Path, position: dict, frame_po
         new_size = (int(overlay.width * scale), int(overlay.height * scale))
         overlay = overlay.resize(new_size, Image.Resampling.LANCZOS)
 
-    # Composite
+    # Composite in NumPy - only the overlay's footprint is blended, and the
+    # cached hero is copied with a single memcpy rather than touched
     result = hero.copy()
     x, y = int(position["x"]), int(position["y"])
+    _alpha_over(result, np.asarray(overlay), x, y)
 
-    result.paste(overlay, (x, y), overlay)
-    return result
+    return Image.fromarray(result)
 
 
-def create_text_preview(hero_path: Path, text: str, font_path: Path, font_size: int, color: str, position: dict) -> Image.Image:
+def create_text_preview(hero_path: Path, text: str, font_path: str, font_size: int, color: str, position: dict) -> Image.Image:
     """
     Create a preview with text overlay
 
     Args:
         hero_path: Path to hero image
         text: Text to overlay
-        font_path: Path to font file (TTF/OTF)
+        font_path: Path string to font file (TTF/OTF), as from scan_font_families
         font_size: Font size in pixels
         color: Hex color code (e.g., "#FFFFFF")
         position: Dict with x, y, alignment keys
@@ -66,17 +164,18 @@ def create_text_preview(hero_path: Path, text: str, font_path: Path, font_size:
     Returns:
         PIL Image with text overlay
     """
-    from PIL import ImageDraw, ImageFont
+    from PIL import ImageDraw
 
-    # Load hero image
-    hero = Image.open(hero_path).convert("RGBA")
+    # Load hero image - a read-only view of the cached array, no copy
+    hero = Image.fromarray(load_hero_array(str(hero_path), hero_path.stat().st_mtime_ns))
 
-    # Create drawing context
-    draw = ImageDraw.Draw(hero)
+    # Draw on a transparent layer so the cached hero is never mutated
+    text_layer = Image.new("RGBA", hero.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(text_layer)
 
     # Load font
-    if font_path and font_path.exists():
-        font = ImageFont.truetype(str(font_path), font_size)
+    if font_path:
+        font = load_font(font_path, font_size)
     else:
         # Fallback to default font if no font file provided
         font = ImageFont.load_default()
@@ -88,7 +187,7 @@ def create_text_preview(hero_path: Path, text: str, font_path: Path, font_size:
 
     # Convert hex color to RGB tuple
     # Color picker returns "#FFFFFF", PIL needs (255, 255, 255)
-    color_rgb = tuple(int(color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+    color_rgb = _hex_to_rgb(color)
 
     # Draw text
     draw.text(
@@ -99,7 +198,7 @@ def create_text_preview(hero_path: Path, text: str, font_path: Path, font_size:
         anchor=alignment
     )
 
-    return hero
+    return Image.alpha_composite(hero, text_layer)
 
 
 def create_multiline_text_preview(
@@ -108,7 +207,8 @@ def create_multiline_text_preview(
     font_family: dict,
     color: str,
     position: dict,
-    line_spacing: int = 10
+    line_spacing: int = 10,
+    max_display: int = 600
 ) -> Image.Image:
     """
     Create a preview with multiple text lines with different styles
@@ -116,27 +216,33 @@ def create_multiline_text_preview(
     Args:
         hero_path: Path to hero image
         lines: List of dicts with text, size, style keys
-        font_family: Dict of font style variants
+        font_family: Dict of font style variants (path strings from scan_font_families)
         color: Hex color code
         position: Dict with x, y, alignment keys
         line_spacing: Vertical spacing between lines
+        max_display: Max preview width/height - text is drawn at this size
 
     Returns:
-        PIL Image with multi-line text overlay
+        PIL Image with multi-line text overlay, at most max_display pixels
     """
-    from PIL import ImageDraw, ImageFont
+    from PIL import ImageDraw
+
+    # Load hero image at display size so text is rasterized only over the
+    # pixels that will actually be shown
+    hero, k = _load_display_hero(str(hero_path), hero_path.stat().st_mtime_ns, max_display)
 
-    # Load hero image
-    hero = Image.open(hero_path).convert("RGBA")
-    draw = ImageDraw.Draw(hero)
+    # Draw on a transparent layer so the cached hero is never mutated
+    text_layer = Image.new("RGBA", hero.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(text_layer)
 
     # Convert hex color to RGB
-    color_rgb = tuple(int(color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+    color_rgb = _hex_to_rgb(color)
 
-    # Get base position
-    base_x = int(position.get("x", 0))
-    base_y = int(position.get("y", 0))
+    # Get base position, in preview pixels
+    base_x = int(position.get("x", 0) * k)
+    base_y = int(position.get("y", 0) * k)
     alignment = position.get("alignment", "mm")
+    line_spacing = int(line_spacing * k)
 
     # Calculate total height and load fonts
     total_height = 0
@@ -147,17 +253,18 @@ def create_multiline_text_preview(
         if not text:  # Skip empty lines
             continue
 
-        size = line_data.get("size", 48)
+        size = max(1, int(line_data.get("size", 48) * k))
         style = line_data.get("style", "Regular")
 
         # Load appropriate font variant
         font_path = font_family.get(style, font_family.get("Regular"))
-        if font_path and font_path.exists():
-            font = ImageFont.truetype(str(font_path), size)
+        if font_path:
+            font = load_font(font_path, size)
         else:
             font = ImageFont.load_default()
 
-        # Get text dimensions
+        # Get text dimensions - same tight bbox as composite_multiline_text,
+        # so lines land where the final render puts them
         bbox = draw.textbbox((0, 0), text, font=font, anchor=alignment)
         text_height = bbox[3] - bbox[1]
 
@@ -192,4 +299,4 @@ def create_multiline_text_preview(
         )
         current_y += line_info["height"] + line_spacing
 
-    return hero
+    return Image.alpha_composite(hero, text_layer)
@@ -6,9 +6,8 @@ Custom CSS injection and icon definitions
 import streamlit as st
 
 
-def inject_css():
-    """Inject custom CSS for Channel 4 inspired theme"""
-    st.markdown("""
+# Custom CSS for Channel 4 inspired theme
+CSS = """
 <style>
 /* Color variables - Channel 4 inspired palette */
 :root {
@@ -186,7 +185,17 @@ h1 {
     color: var(--text-primary);
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+def inject_css():
+    """
+    Inject custom CSS for Channel 4 inspired theme
+
+    Must run on every rerun - Streamlit removes elements that a rerun
+    doesn't emit again, so skipping it would drop the styles.
+    """
+    st.markdown(CSS, unsafe_allow_html=True)
 
 
 # SVG icons (Lucide-style)
@@ -201,3 +210,6 @@ ICONS = {
     "type": '<svg xmlns="http://www.w3.org/2000/svg" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polyline points="4 7 4 4 20 4 20 7"></polyline><line x1="9" x2="15" y1="20" y2="20"></line><line x1="12" x2="12" y1="4" y2="20"></line></svg>',
     "edit": '<svg xmlns="http://www.w3.org/2000/svg" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M17 3a2.85 2.83 0 1 1 4 4L7.5 20.5 2 22l1.5-5.5Z"></path><path d="m15 5 4 4"></path></svg>',
 }
+
+# Icons wrapped in the accent color, for inline use in headers
+ICONS_HTML = {name: f'<span style="color: #7cb518">{svg}</span>' for name, svg in ICONS.items()}
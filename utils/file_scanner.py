@@ -3,59 +3,168 @@ File Scanner Utilities
 Functions for scanning input directories and managing subfolder structures
 """
 
+import heapq
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+from typing import Optional, Union
 
 
-def scan_inputs(base_path: Path) -> dict:
-    """Scan input folders and return found files organized by subfolder"""
+# Lowercase file suffixes - matched against lowercased names, so any case works
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+VIDEO_EXTS = (".mov", ".mp4")
+FONT_EXTS = (".ttf", ".otf")
 
-    def scan_with_subfolders(path: Path, extensions: list) -> dict:
-        """Scan directory for files, organizing by subfolder"""
-        result = {"root": [], "subfolders": {}}
+# Input folders (relative to base path) and the extensions scanned in each
+INPUT_DIRS = {
+    "heroes_1x1": ("inputs/heroes/1x1", IMAGE_EXTS),
+    "heroes_9x16": ("inputs/heroes/9x16", IMAGE_EXTS),
+    "overlays_static_1x1": ("inputs/overlays/static/1x1", (".png",)),
+    "overlays_static_9x16": ("inputs/overlays/static/9x16", (".png",)),
+    "overlays_video_1x1": ("inputs/overlays/video/1x1", VIDEO_EXTS),
+    "overlays_video_9x16": ("inputs/overlays/video/9x16", VIDEO_EXTS)
+}
 
-        if not path.exists():
-            return result
+# Font filename stem split into family and trailing style, e.g. "Arial-BoldItalic"
+_STYLE_RE = re.compile(r"^(?P<family>.+?)(?:[-\s](?P<style>BoldItalic|Bold Italic|Bold|Italic|Regular))?$")
+
+# Scan results keyed by (kind, base path), with the folders they listed and
+# those folders' mtimes as read just before listing: (paths, mtimes, result)
+_scan_cache: dict[tuple[str, Path], tuple[tuple, tuple, object]] = {}
 
-        # Get files in root
-        for ext in extensions:
-            result["root"].extend(list(path.glob(f"*.{ext}")))
 
-        # Get subfolders and their files
-        for subfolder in path.iterdir():
-            if subfolder.is_dir():
-                files = []
-                for ext in extensions:
-                    files.extend(list(subfolder.glob(f"*.{ext}")))
+def _scan_dir(path: os.PathLike, extensions: tuple) -> tuple[list[Path], list[os.DirEntry]]:
+    """
+    Single directory pass returning (matching files, subdirectories)
+
+    Subdirectories are only ever rescanned or named, so they are returned as
+    the raw DirEntry objects rather than wrapped in Path.
+    """
+    files, subdirs = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            # d_type answers both checks without a stat, except for symlinks
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry)
+            elif entry.is_file() and entry.name.lower().endswith(extensions):
+                files.append(Path(entry.path))
+    return files, subdirs
+
+
+def scan_with_subfolders(path: Union[str, os.PathLike], extensions: tuple) -> dict:
+    """
+    Scan directory for files, organizing by subfolder
+
+    Each directory is listed once and matched case-insensitively against
+    lowercase dotted suffixes, e.g. IMAGE_EXTS. Symlinked files are included,
+    but symlinked subfolders are not scanned - the input tree is treated as
+    a real hierarchy.
+    """
+    result = {"root": [], "subfolders": {}}
+
+    # Each folder's mtime is read just before it is listed and kept under
+    # _watched, so any later change to it shows up in the scan memo's check
+    root_mtime = _mtime(path)
+    watched = [(os.fspath(path), root_mtime)]
+
+    # Get files in root, plus the subfolders to scan. A missing or unreadable
+    # folder is treated as empty rather than probed up front
+    try:
+        result["root"], subfolders = _scan_dir(path, extensions)
+    except OSError:
+        result["_watched"] = tuple(watched)
+        return result
+
+    def scan_subfolder(subfolder):
+        # Unreadable, or removed since the root listing - treat as empty
+        mtime = _mtime(subfolder)
+        try:
+            return mtime, _scan_dir(subfolder, extensions)[0]
+        except OSError:
+            return mtime, []
+
+    # Get subfolders and their files. Listings are issued side by side so a
+    # slow (e.g. network) mount waits one round trip per batch, not per folder
+    if subfolders:
+        with ThreadPoolExecutor(max_workers=min(8, len(subfolders))) as executor:
+            scans = executor.map(scan_subfolder, subfolders)
+            for subfolder, (mtime, files) in zip(subfolders, scans):
+                # Empty subfolders are watched too, so files added later show up
+                watched.append((subfolder.path, mtime))
                 if files:
                     result["subfolders"][subfolder.name] = files
 
-        return result
+    result["_watched"] = tuple(watched)
+
+    # Flattened list for flatten_files / filter_by_subfolder("all")
+    result["_flat"] = list(chain(result["root"], *result["subfolders"].values()))
 
-    image_exts = ["png", "jpg", "jpeg", "PNG", "JPG", "JPEG"]
-    video_exts = ["mov", "MOV", "mp4", "MP4"]
+    # Sorted names for get_subfolders / get_all_subfolders, built once per scan
+    result["_sorted_names"] = sorted(result["subfolders"])
 
-    return {
-        "heroes_1x1": scan_with_subfolders(base_path / "inputs/heroes/1x1", image_exts),
-        "heroes_9x16": scan_with_subfolders(base_path / "inputs/heroes/9x16", image_exts),
-        "overlays_static_1x1": scan_with_subfolders(base_path / "inputs/overlays/static/1x1", ["png", "PNG"]),
-        "overlays_static_9x16": scan_with_subfolders(base_path / "inputs/overlays/static/9x16", ["png", "PNG"]),
-        "overlays_video_1x1": scan_with_subfolders(base_path / "inputs/overlays/video/1x1", video_exts),
-        "overlays_video_9x16": scan_with_subfolders(base_path / "inputs/overlays/video/9x16", video_exts)
-    }
+    # Reverse index for get_file_label, built once per scan
+    result["_label_index"] = build_label_index(result)
+
+    return result
+
+
+def scan_inputs(base_path: Path) -> dict:
+    """
+    Scan input folders and return found files organized by subfolder
+
+    The result is memoized and shared between callers, so treat it as
+    read-only. Each call stats the input roots and every subfolder found by
+    the last scan (one syscall per folder instead of a full walk). A folder's
+    mtime changes when entries are added, removed or renamed in it, so any
+    change to the listings triggers a rescan.
+    """
+    return _memoized("inputs", base_path, _scan_all_inputs)
+
+
+def _scan_all_inputs(base_path: Path) -> tuple[tuple, dict]:
+    """Walk every input folder (uncached), returning (watched folders, inputs)"""
+    # The folders are independent and scandir releases the GIL, so scanning
+    # them side by side costs the slowest folder rather than the sum
+    root = os.fspath(base_path)
+    with ThreadPoolExecutor(max_workers=len(INPUT_DIRS)) as executor:
+        futures = {
+            key: executor.submit(scan_with_subfolders, f"{root}/{rel_path}", extensions)
+            for key, (rel_path, extensions) in INPUT_DIRS.items()
+        }
+        inputs = {key: future.result() for key, future in futures.items()}
+
+    return tuple(chain.from_iterable(file_dict["_watched"] for file_dict in inputs.values())), inputs
 
 
 def flatten_files(file_dict: dict) -> list[Path]:
-    """Flatten subfolder structure into single file list"""
-    files = list(file_dict.get("root", []))
-    for subfolder_files in file_dict.get("subfolders", {}).values():
-        files.extend(subfolder_files)
-    return files
+    """
+    Flatten subfolder structure into single file list
+
+    Scans store the list under _flat up front (dicts built elsewhere get it
+    on first use), so callers must treat it as read-only. A rescan produces
+    new dicts, which resets it.
+    """
+    if "_flat" not in file_dict:
+        file_dict["_flat"] = list(chain(
+            file_dict.get("root", []),
+            *file_dict.get("subfolders", {}).values()
+        ))
+    return file_dict["_flat"]
+
+
+def _sorted_subfolder_names(file_dict: dict) -> list[str]:
+    """Get subfolder names in sorted order, precomputed by the scan when available"""
+    names = file_dict.get("_sorted_names")
+    return names if names is not None else sorted(file_dict.get("subfolders", {}))
 
 
 def get_subfolders(file_dict: dict) -> list[str]:
     """Get list of available subfolders"""
-    subfolders = list(file_dict.get("subfolders", {}).keys())
-    return ["all"] + sorted(subfolders) if subfolders else ["all"]
+    return ["all", *_sorted_subfolder_names(file_dict)]
 
 
 def filter_by_subfolder(file_dict: dict, subfolder: str) -> list[Path]:
@@ -66,43 +175,45 @@ def filter_by_subfolder(file_dict: dict, subfolder: str) -> list[Path]:
         return file_dict.get("subfolders", {}).get(subfolder, [])
 
 
+def build_label_index(file_dict: dict) -> dict:
+    """Build reverse index mapping each subfolder file to its "[subfolder] " label prefix"""
+    index = {}
+    for subfolder_name, files in file_dict.get("subfolders", {}).items():
+        # One interned prefix per subfolder, shared by its files and across dicts
+        prefix = sys.intern(f"[{subfolder_name}] ")
+        index.update(dict.fromkeys(files, prefix))
+    return index
+
+
 def get_file_label(file_path: Path, file_dict: dict) -> str:
     """Get display label for file showing subfolder if applicable"""
-    # Check if file is in a subfolder
-    for subfolder_name, files in file_dict.get("subfolders", {}).items():
-        if file_path in files:
-            return f"[{subfolder_name}] {file_path.name}"
-    return file_path.name
+    # Scans store the index up front; dicts built elsewhere get one on first use
+    index = file_dict.get("_label_index")
+    if index is None:
+        index = file_dict["_label_index"] = build_label_index(file_dict)
+
+    prefix = index.get(file_path)
+    return prefix + file_path.name if prefix else file_path.name
 
 
 def get_all_subfolders(*file_dicts) -> list[str]:
     """Get combined list of all unique subfolders across multiple file dicts"""
-    all_subfolders = set()
-    for file_dict in file_dicts:
-        all_subfolders.update(file_dict.get("subfolders", {}).keys())
-    return ["all"] + sorted(all_subfolders) if all_subfolders else ["all"]
+    # Each list is already sorted, so a merge keeps order and duplicates end
+    # up adjacent - dict.fromkeys drops them without re-sorting
+    merged = heapq.merge(*(_sorted_subfolder_names(file_dict) for file_dict in file_dicts))
+    return ["all", *dict.fromkeys(merged)]
 
 
 def scan_fonts(base_path: Path) -> list[Path]:
     """
     Scan assets/fonts/ directory for font files
 
+    Memoized until the fonts folder's mtime changes.
+
     Returns:
         List of Path objects for TTF/OTF font files
     """
-    fonts_path = base_path / "assets/fonts"
-
-    # Create directory if it doesn't exist
-    if not fonts_path.exists():
-        fonts_path.mkdir(parents=True, exist_ok=True)
-        return []
-
-    fonts = []
-    # Scan for TrueType and OpenType fonts
-    for ext in ["ttf", "TTF", "otf", "OTF"]:
-        fonts.extend(list(fonts_path.glob(f"*.{ext}")))
-
-    return sorted(fonts)
+    return _memoized("fonts", base_path, _scan_fonts_grouped)[0]
 
 
 def scan_font_families(base_path: Path) -> dict:
@@ -110,44 +221,109 @@ def scan_font_families(base_path: Path) -> dict:
     Scan fonts and group by family with available styles
 
     Returns:
-        Dict mapping family names to available style variants
+        Dict mapping family names to available style variants, as absolute
+        path strings ready to pass to FreeType (resolved once at scan time)
         Example: {
             "Arial": {
-                "Regular": Path("Arial.ttf"),
-                "Bold": Path("Arial-Bold.ttf"),
-                "Italic": Path("Arial-Italic.ttf")
+                "Regular": "/.../assets/fonts/Arial.ttf",
+                "Bold": "/.../assets/fonts/Arial-Bold.ttf",
+                "Italic": "/.../assets/fonts/Arial-Italic.ttf"
             }
         }
     """
-    fonts = scan_fonts(base_path)
-    families = {}
-
-    for font_path in fonts:
-        font_name = font_path.stem  # Filename without extension
-
-        # Detect style from filename
-        style = "Regular"
-        family_name = font_name
-
-        # Common naming patterns
-        if "-Bold" in font_name or " Bold" in font_name:
-            if "-BoldItalic" in font_name or " Bold Italic" in font_name:
-                style = "Bold Italic"
-                family_name = font_name.replace("-BoldItalic", "").replace(" Bold Italic", "")
-            else:
-                style = "Bold"
-                family_name = font_name.replace("-Bold", "").replace(" Bold", "")
-        elif "-Italic" in font_name or " Italic" in font_name:
-            style = "Italic"
-            family_name = font_name.replace("-Italic", "").replace(" Italic", "")
-        elif "-Regular" in font_name or " Regular" in font_name:
-            style = "Regular"
-            family_name = font_name.replace("-Regular", "").replace(" Regular", "")
+    return _memoized("fonts", base_path, _scan_fonts_grouped)[1]
+
+
+@lru_cache(maxsize=4096)
+def _parse_family_style(font_name: str) -> tuple[str, str]:
+    """Split a font filename stem into (family, style), e.g. ("Arial", "Bold Italic")"""
+    # A name with no separator can't carry a style suffix, so skip the regex
+    if "-" not in font_name and " " not in font_name:
+        return font_name, "Regular"
+
+    match = _STYLE_RE.match(font_name)
+    return match["family"], (match["style"] or "Regular").replace("BoldItalic", "Bold Italic")
+
+
+def _scan_fonts_grouped(base_path: Path) -> tuple[tuple, tuple[list[Path], dict]]:
+    """
+    List the fonts folder and group it by family in one pass (uncached)
+
+    Returns:
+        (watched folders, (fonts, families))
+    """
+    fonts_path = base_path / "assets/fonts"
+    watched = ((os.fspath(fonts_path), _mtime(fonts_path)),)
+
+    # Scan for TrueType and OpenType fonts. d_type answers is_dir without a
+    # stat, and symlinked font files are still picked up
+    try:
+        with os.scandir(fonts_path) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if not entry.is_dir(follow_symlinks=False) and entry.name.lower().endswith(FONT_EXTS)
+            )
+    except FileNotFoundError:
+        # Create directory if it doesn't exist - only probed on failure
+        fonts_path.mkdir(parents=True, exist_ok=True)
+        return watched, ([], {})
+    except OSError:
+        # Unreadable, or not a directory - no fonts
+        return watched, ([], {})
+
+    # Resolve the folder once rather than every font in it
+    fonts_dir = str(fonts_path.resolve())
+    fonts, families = [], {}
+
+    for name in names:
+        font_path = fonts_path / name
+        fonts.append(font_path)
 
         # Group by family
-        if family_name not in families:
-            families[family_name] = {}
+        family_name, style = _parse_family_style(font_path.stem)
+        families.setdefault(family_name, {})[style] = os.path.join(fonts_dir, name)
+
+    return watched, (fonts, families)
+
+
+def _memoized(kind: str, base_path: Path, scan):
+    """
+    Return the cached scan(base_path) result for kind while every folder it
+    listed still has the mtime it had then, rescanning otherwise
+
+    scan must return ((path, mtime_ns) pairs for the folders it listed, result).
+    """
+    key = (kind, base_path)
+    cached = _scan_cache.get(key)
+    if cached is not None:
+        paths, mtimes, result = cached
+        if _mtime_signature(*paths) == mtimes:
+            return result
+
+    watched, result = scan(base_path)
+    paths, mtimes = zip(*watched)
+    _scan_cache[key] = (paths, mtimes, result)
+    return result
+
+
+def clear_scan_cache():
+    """
+    Forget all memoized scans so the next call re-walks the folders
+
+    Only needed if a change slips past the mtime check, e.g. on filesystems
+    with coarse timestamps.
+    """
+    _scan_cache.clear()
+
+
+def _mtime(path: Union[str, os.PathLike]) -> Optional[int]:
+    """Get a folder's st_mtime_ns, or None if it can't be stat'd (e.g. missing)"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-        families[family_name][style] = font_path
 
-    return families
+def _mtime_signature(*paths: Union[str, os.PathLike]) -> tuple:
+    """Get modification times of the given paths (None if missing) for use as a cache key"""
+    return tuple(_mtime(path) for path in paths)